@@ -1,10 +1,63 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+import time
+from contextlib import contextmanager
+from apify_agent.host_scheduler import HostScheduler, THROTTLE_STATUSES
+from config import (
+    MAX_PAGE_BYTES, CRAWL_HOST_INITIAL_CONCURRENCY, CRAWL_HOST_MAX_CONCURRENCY,
+    CRAWL_DEFAULT_BACKOFF, CRAWL_MAX_BACKOFF_WAIT
+)
+
+# DuckDuckGo answers 202 with a challenge page when it rate limits a client
+SEARCH_BLOCK_STATUSES = THROTTLE_STATUSES | {202}
 
 class WebCrawler:
-    def __init__(self):
-        pass
+    def __init__(self, max_page_bytes=MAX_PAGE_BYTES, scheduler=None):
+        # Cap on HTML bytes read per page, bounds memory per crawled source
+        self.max_page_bytes = max_page_bytes
+        # Pooled keep-alive connections, shared by all in-flight requests
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Per-host AIMD concurrency and backoff, shared by all in-flight requests
+        self.scheduler = scheduler or HostScheduler(
+            initial_limit=CRAWL_HOST_INITIAL_CONCURRENCY,
+            max_limit=CRAWL_HOST_MAX_CONCURRENCY,
+            default_backoff=CRAWL_DEFAULT_BACKOFF,
+            max_wait=CRAWL_MAX_BACKOFF_WAIT
+        )
+
+    @contextmanager
+    def _fetch(self, url, headers, stream=False, block_statuses=THROTTLE_STATUSES):
+        """
+        GET through the host scheduler. The host slot is held, and latency
+        measured, until the with block exits, so streamed bodies must be
+        read inside it. Exceptions in the block count as a host error.
+        """
+        host = self.scheduler.acquire(url)
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(url, headers=headers, timeout=10, stream=stream)
+            yield resp
+        except Exception:
+            self.scheduler.release(host, time.perf_counter() - start, error=True)
+            raise
+
+        # Report host-specific block statuses as a throttle
+        status = 429 if resp.status_code in block_statuses else resp.status_code
+        self.scheduler.release(
+            host,
+            time.perf_counter() - start,
+            status=status,
+            retry_after=resp.headers.get("Retry-After")
+        )
+
+    def _get(self, url, headers, block_statuses=THROTTLE_STATUSES):
+        """GET a (non-streamed) response through the host scheduler."""
+        with self._fetch(url, headers, block_statuses=block_statuses) as resp:
+            return resp
 
     def search_top_urls(self, query, max_results=5):
         """Search DuckDuckGo Lite HTML and extract top URLs."""
@@ -30,7 +83,16 @@ class WebCrawler:
                 "Referer": "https://www.google.com/"
             }
 
-            resp = requests.get(url, headers=headers, timeout=10)
+            # Retry once after the host's backoff if we are being blocked,
+            # instead of scraping links off a challenge page
+            for attempt in range(2):
+                resp = self._get(url, headers, block_statuses=SEARCH_BLOCK_STATUSES)
+                if resp.status_code not in SEARCH_BLOCK_STATUSES:
+                    break
+                print(f"[MultiSource] Search blocked ({resp.status_code}), attempt {attempt + 1}/2")
+            else:
+                return []
+
             soup = BeautifulSoup(resp.text, "html.parser")
 
             urls = []
@@ -75,21 +137,96 @@ class WebCrawler:
             return []
         
 
+    def _read_limited(self, resp):
+        """Read a streamed response body up to max_page_bytes and decode it."""
+        body = bytearray()
+        try:
+            for block in resp.iter_content(chunk_size=65536):
+                body.extend(block)
+                if len(body) >= self.max_page_bytes:
+                    print(f"[MultiSource] Page truncated at {self.max_page_bytes} bytes: {resp.url}")
+                    del body[self.max_page_bytes:]
+                    break
+        finally:
+            resp.close()
+        return body.decode(resp.encoding or "utf-8", errors="replace")
+
+    def _extract_text(self, html):
+        """Strip scripts/styles and return readable text from HTML."""
+        soup = BeautifulSoup(html, "html.parser")
+
+        # Remove scripts and styles
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        text = soup.get_text(separator=" ", strip=True)
+        # The parse tree is a web of reference cycles; break it now so the
+        # page is freed by refcounting instead of waiting for a GC pass.
+        # The root's next_element is None, so decompose() on it alone does
+        # not reach the tree: decompose each top-level node first.
+        for node in list(soup.contents):
+            node.decompose()
+        soup.decompose()
+        return text
+
     def crawl_url(self, url):
         """Fetch raw HTML and extract readable text."""
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0"
             }
-            resp = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(resp.text, "html.parser")
+            # Hold the host slot for the body download, not for parsing
+            with self._fetch(url, headers, stream=True) as resp:
+                html = self._read_limited(resp)
+            return self._extract_text(html)
 
-            # Remove scripts and styles
-            for script in soup(["script", "style"]):
-                script.extract()
+        except Exception as e:
+            return f"[Error crawling {url}]"
+
+    def crawl_url_conditional(self, url, etag=None, last_modified=None):
+        """
+        Fetch a URL with HTTP validators from a previous crawl.
+        Returns dict with status ("ok", "not_modified" or "error"), text and
+        the new validators. Text is only extracted when the page changed.
+        """
+        try:
+            headers = {
+                "User-Agent": "Mozilla/5.0"
+            }
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+            # Hold the host slot for the body download, not for parsing
+            with self._fetch(url, headers, stream=True) as resp:
+                if resp.status_code == 304 or resp.status_code >= 400:
+                    resp.close()
+                    html = None
+                else:
+                    html = self._read_limited(resp)
+
+            if resp.status_code == 304:
+                return {
+                    "status": "not_modified",
+                    "text": None,
+                    "etag": etag,
+                    "last_modified": last_modified
+                }
 
-            text = soup.get_text(separator=" ", strip=True)
-            return text
+            resp.raise_for_status()
+            return {
+                "status": "ok",
+                "text": self._extract_text(html),
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified")
+            }
 
         except Exception as e:
-            return f"[Error crawling {url}]"
+            print(f"[Tracking] Conditional crawl failed for {url}: {e}")
+            return {
+                "status": "error",
+                "text": None,
+                "etag": etag,
+                "last_modified": last_modified
+            }
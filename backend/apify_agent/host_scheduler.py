@@ -0,0 +1,154 @@
+"""
+Per-host crawl scheduler for AutoResearcher AI
+Coordinates every in-flight fetch to the same host: concurrency adapts with
+additive increase / multiplicative decrease (AIMD), throttling responses
+(429/403/503) back off the host for all requests, and Retry-After is honored.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Responses that mean "slow down" rather than "this page is missing"
+THROTTLE_STATUSES = {403, 429, 503}
+
+
+class HostBackoff(Exception):
+    """Raised when a host stays backed off longer than the caller will wait."""
+
+    def __init__(self, host: str, wait: float):
+        super().__init__(f"Host {host} backed off for {wait:.1f}s")
+        self.host = host
+        self.wait = wait
+
+
+def parse_retry_after(value):
+    """Retry-After as seconds (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.inflight = 0
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.avg_latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+
+class HostScheduler:
+    """
+    AIMD concurrency limiter keyed by host.
+
+    - Success: limit += increase / limit (about +1 per round of requests)
+    - Throttle or error: limit *= decrease, and throttles block the host
+      until Retry-After (or an exponential default backoff) has passed
+    """
+
+    def __init__(self, initial_limit: float = 2, max_limit: float = 8, min_limit: float = 1,
+                 increase: float = 1.0, decrease: float = 0.5,
+                 default_backoff: float = 10, max_backoff: float = 300, max_wait: float = 30):
+        self.initial_limit = initial_limit
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.default_backoff = default_backoff
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._hosts = {}
+
+    # --- Public API ---
+
+    def acquire(self, url: str) -> str:
+        """
+        Wait for a slot on the URL's host and return the host key.
+        Raises HostBackoff if the host is backed off for longer than max_wait.
+        """
+        host = urlparse(url).hostname or url
+        deadline = time.time() + self.max_wait
+        with self._cond:
+            state = self._state(host)
+            while True:
+                now = time.time()
+                if state.blocked_until > deadline:
+                    raise HostBackoff(host, state.blocked_until - now)
+                if now >= state.blocked_until and state.inflight < max(1, int(state.limit)):
+                    state.inflight += 1
+                    return host
+                if now >= deadline:
+                    raise HostBackoff(host, max(state.blocked_until - now, 0))
+                wake_at = state.blocked_until if state.blocked_until > now else deadline
+                self._cond.wait(timeout=max(wake_at - now, 0.01))
+
+    def release(self, host: str, latency: float, status: int = None, retry_after=None, error: bool = False):
+        """Record the outcome of a fetch and adjust the host's concurrency."""
+        with self._cond:
+            state = self._state(host)
+            state.inflight -= 1
+            state.requests += 1
+            state.avg_latency = latency if state.avg_latency is None else 0.8 * state.avg_latency + 0.2 * latency
+
+            throttled = status in THROTTLE_STATUSES
+            failed = error or (status is not None and status >= 500 and not throttled)
+            state.error_rate = 0.9 * state.error_rate + (0.1 if (throttled or failed) else 0.0)
+
+            if throttled:
+                state.throttled += 1
+                state.consecutive_throttles += 1
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+                backoff = parse_retry_after(retry_after)
+                if backoff is None:
+                    backoff = self.default_backoff * (2 ** (state.consecutive_throttles - 1))
+                backoff = min(backoff, self.max_backoff)
+                state.blocked_until = max(state.blocked_until, time.time() + backoff)
+                print(f"[Scheduler] {host} throttled ({status}), backing off {backoff:.1f}s, limit {state.limit:.2f}")
+            elif failed:
+                state.errors += 1
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+            else:
+                state.consecutive_throttles = 0
+                state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.time()
+            return {
+                host: {
+                    "limit": round(state.limit, 2),
+                    "inflight": state.inflight,
+                    "backoff_remaining": round(max(state.blocked_until - now, 0), 1),
+                    "avg_latency": round(state.avg_latency, 3) if state.avg_latency is not None else None,
+                    "error_rate": round(state.error_rate, 3),
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "errors": state.errors
+                }
+                for host, state in self._hosts.items()
+            }
+
+    # --- Helpers ---
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_limit)
+        return state
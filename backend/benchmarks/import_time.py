@@ -0,0 +1,93 @@
+"""
+Import-time benchmark for AutoResearcher AI
+Measures the cold import of the API module in fresh interpreters with
+`python -X importtime` and checks that heavy dependencies stay deferred.
+Exits non-zero on a regression, so it can run in CI.
+
+Usage (from backend/):
+    python -m benchmarks.import_time [--runs 5] [--max-ms 800]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Must not be imported by `import main`; they load during warm-up instead.
+# dotenv stays eager on purpose: config.py must load .env before any setting
+# is read, and most of its ~9 ms is `logging`, which main imports anyway.
+DEFERRED_MODULES = ["requests", "bs4", "numpy"]
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str) -> tuple:
+    """Return (cumulative import ms of module, top 10 direct imports by ms)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    total_us = None
+    children = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue  # header row
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            # Children are printed before their parent
+            if name.strip() == module:
+                total_us = cumulative_us
+                break
+            children = []
+        elif depth == 1:
+            children.append((cumulative_us / 1000, name.strip()))
+    return total_us / 1000, sorted(children, reverse=True)[:10]
+
+
+def loaded_deferred(module: str) -> list:
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return [m for m in proc.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        total_ms, slowest = measure(args.module)
+        timings.append(total_ms)
+
+    median = statistics.median(timings)
+    print(f"import {args.module}: median {median:.1f} ms, min {min(timings):.1f} ms over {args.runs} runs")
+    print("Slowest direct imports (last run):")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failed = False
+    eager = loaded_deferred(args.module)
+    if eager:
+        print(f"REGRESSION: heavy modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"REGRESSION: median {median:.1f} ms exceeds {args.max_ms:.1f} ms")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Pipeline memory benchmark for AutoResearcher AI
+Measures, for one research request as the number of sources grows:
+- peak Python heap (tracemalloc), in this process
+- peak RSS growth, in a fresh subprocess per measurement, so allocator
+  reuse from earlier runs cannot hide it (VmHWM - VmRSS, Linux /proc)
+for the streaming pipeline and for the previous hold-every-page approach.
+No network or LLM calls are made.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline_memory [--page-kb 500] [--sources 1 5 10 20]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tracemalloc
+
+from apify_agent.crawler import WebCrawler
+from llm.summarizer import Summarizer
+from utils.cleaner import clean_text
+from utils.pipeline import run_pipeline
+from utils.shared_state import MemorySharedState
+
+
+class SyntheticCrawler(WebCrawler):
+    """Crawler that builds an HTML page of a fixed size instead of fetching."""
+
+    def __init__(self, page_kb):
+        super().__init__()
+        self.page_kb = page_kb
+
+    def crawl_url(self, url):
+        paragraph = f"<p>{url} " + "Research content sentence with enough words to survive cleaning. " * 8 + "</p>\n"
+        html = "<html><body>" + paragraph * (self.page_kb * 1024 // len(paragraph)) + "</body></html>"
+        return self._extract_text(html)
+
+
+class OfflineSummarizer(Summarizer):
+    """Summarizer that returns canned output without calling an LLM."""
+
+    def __init__(self):
+        super().__init__(shared_state=MemorySharedState())
+        self.rate_limit_per_min = 0
+
+    def summarize(self, text, model=None, max_tokens=None):
+        return f"summary of {len(text)} chars"
+
+
+def legacy_pipeline(crawler, summarizer, urls):
+    """The pre-streaming flow: all raw pages held, merged text built with +=."""
+    raw_pages = {}
+    for u in urls:
+        raw_pages[u] = crawler.crawl_url(u)
+    merged_cleaned = ""
+    for src, raw in raw_pages.items():
+        merged_cleaned += f"\n\n--- SOURCE: {src} ---\n{clean_text(raw)}\n"
+    str(raw_pages)  # report path
+    return summarizer.summarize_multi_source(merged_cleaned)
+
+
+def peak_kb(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak // 1024
+
+
+def run_request(mode, crawler, summarizer, urls, text_budget):
+    if mode == "streaming":
+        return run_pipeline(crawler, summarizer, urls, text_budget)
+    return legacy_pipeline(crawler, summarizer, urls)
+
+
+def rss_growth_kb(mode, n, args):
+    """Peak RSS growth of one request, measured in a fresh interpreter."""
+    cmd = [sys.executable, "-m", "benchmarks.pipeline_memory", "--child", mode, str(n),
+           "--page-kb", str(args.page_kb), "--text-budget", str(args.text_budget)]
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])["rss_growth_kb"]
+
+
+def _proc_status_kb(field):
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+
+def child(mode, n, args):
+    crawler = SyntheticCrawler(args.page_kb)
+    summarizer = OfflineSummarizer()
+    urls = [f"https://example.com/page/{i}" for i in range(n)]
+    # Warm up imports and parser caches on a tiny page, then measure the request
+    SyntheticCrawler(1).crawl_url("https://example.com/warmup")
+    # ru_maxrss survives exec (it would report the parent's peak), so use the
+    # per-process high-water mark, reset to the current RSS before the request
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    before = _proc_status_kb("VmRSS")
+    run_request(mode, crawler, summarizer, urls, args.text_budget)
+    print(json.dumps({"rss_growth_kb": _proc_status_kb("VmHWM") - before}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-kb", type=int, default=500, help="HTML size per synthetic page")
+    parser.add_argument("--sources", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--text-budget", type=int, default=100000, help="MAX_REQUEST_TEXT_CHARS")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SOURCES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], int(args.child[1]), args)
+        return
+
+    crawler = SyntheticCrawler(args.page_kb)
+    summarizer = OfflineSummarizer()
+
+    print(f"Page size: {args.page_kb} KB HTML, text budget: {args.text_budget} chars")
+    print(f"{'sources':>8} {'streaming heap KB':>18} {'streaming RSS KB':>17} {'legacy heap KB':>15} {'legacy RSS KB':>14}")
+    for n in args.sources:
+        urls = [f"https://example.com/page/{i}" for i in range(n)]
+        row = []
+        for mode in ("streaming", "legacy"):
+            row.append(peak_kb(lambda: run_request(mode, crawler, summarizer, urls, args.text_budget)))
+            row.append(rss_growth_kb(mode, n, args))
+        print(f"{n:>8} {row[0]:>18} {row[1]:>17} {row[2]:>15} {row[3]:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Report rendering benchmark for AutoResearcher AI
+Measures peak Python heap (tracemalloc) and time to build the GitHub upload
+body for a report as the cleaned text grows, for the streamed renderer and
+for the previous build-the-whole-string approach. No network calls are made.
+
+Usage (from backend/):
+    python -m benchmarks.report_memory [--text-kb 100 1000 5000 20000]
+"""
+
+import argparse
+import base64
+import json
+import time
+import tracemalloc
+
+from github_integration.github_client import _put_body
+from github_integration.report_generator import generate_markdown_report, iter_markdown_report
+
+
+def legacy_body(query, result):
+    """The previous flow: full Markdown string, bytes, base64, then json=body."""
+    content = generate_markdown_report(query, result)
+    content_base64 = base64.b64encode(content.encode("utf-8")).decode("utf-8")
+    return json.dumps({"message": "m", "content": content_base64, "branch": "main"}).encode("utf-8")
+
+
+def streamed_body(query, result):
+    with _put_body("m", "main", None, iter_markdown_report(query, result)) as body:
+        return body.read(1)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak // 1024, elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--text-kb", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'text KB':>8} {'streamed peak KB':>17} {'ms':>7} {'legacy peak KB':>15} {'ms':>7}")
+    for kb in args.text_kb:
+        # Built before measuring: the pipeline already holds this text
+        result = {"summary": "Summary text. " * 50, "cleaned": "Cleaned research text. " * (kb * 1024 // 23),
+                  "raw": "Raw page text. " * 500, "sources": ["https://example.com"]}
+        streamed = measure(streamed_body, "benchmark", result)
+        legacy = measure(legacy_body, "benchmark", result)
+        print(f"{kb:>8} {streamed[0]:>17} {streamed[1]:>7.1f} {legacy[0]:>15} {legacy[1]:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Lazily constructed pipeline components for AutoResearcher AI
+
+Heavy dependencies (requests, bs4, numpy) are imported only when a component
+is first built, so importing the API module stays cheap. The app's lifespan
+hook calls warm_up() in the background to build everything (HTTP connection
+pools, caches, GitHub modules) before the first request needs it.
+"""
+
+import logging
+import threading
+import time
+
+from config import (
+    TOPIC_STORE_PATH, QUERY_CACHE_THRESHOLD, QUERY_CACHE_TTL, QUERY_CACHE_MAX_ENTRIES
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class LazyComponent:
+    """Builds its value on first get(), exactly once across threads."""
+
+    def __init__(self, name: str, factory):
+        self.name = name
+        self._factory = factory
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    def get(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    started = time.perf_counter()
+                    self._value = self._factory()
+                    logger.info(f"Initialized {self.name} in {time.perf_counter() - started:.3f}s")
+        return self._value
+
+
+def _make_crawler():
+    from apify_agent.crawler import WebCrawler
+    return WebCrawler()
+
+
+def _make_summarizer():
+    from llm.summarizer import Summarizer
+    return Summarizer()
+
+
+def _make_topic_tracker():
+    from tracking.topic_tracker import TopicTracker
+    return TopicTracker(crawler.get(), summarizer.get(), TOPIC_STORE_PATH)
+
+
+def _make_query_cache():
+    from utils.query_cache import QuerySimilarityCache
+    return QuerySimilarityCache(
+        threshold=QUERY_CACHE_THRESHOLD,
+        ttl=QUERY_CACHE_TTL,
+        max_entries=QUERY_CACHE_MAX_ENTRIES
+    )
+
+
+crawler = LazyComponent("crawler", _make_crawler)
+summarizer = LazyComponent("summarizer", _make_summarizer)
+topic_tracker = LazyComponent("topic_tracker", _make_topic_tracker)
+query_cache = LazyComponent("query_cache", _make_query_cache)
+
+COMPONENTS = [crawler, summarizer, topic_tracker, query_cache]
+
+# Warm-up progress, reported by /ready
+warmup_status = {"state": "pending", "seconds": None, "error": None}
+
+
+def warm_up():
+    """Build every component and pre-import request-time modules."""
+    warmup_status["state"] = "warming"
+    started = time.perf_counter()
+    try:
+        for component in COMPONENTS:
+            component.get()
+
+        # Imported by /github/report on first use otherwise
+        import github_integration.report_generator  # noqa: F401
+        import github_integration.github_client  # noqa: F401
+
+        warmup_status["seconds"] = round(time.perf_counter() - started, 3)
+        warmup_status["state"] = "ready"
+        logger.info(f"Warm-up complete in {warmup_status['seconds']}s")
+    except Exception as e:
+        warmup_status["state"] = "failed"
+        warmup_status["error"] = str(e)
+        logger.error(f"Warm-up failed: {str(e)}")
@@ -1,7 +1,8 @@
 from dotenv import load_dotenv
 import os
 
-# Load environment variables from .env file
+# Load environment variables from .env file (eager: every setting below
+# reads os.environ at import, so this cannot be deferred to warm-up)
 load_dotenv()
 
 # Apify Configuration
@@ -12,6 +13,12 @@ LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # Options: groq, openai, gemin
 LLM_API_KEY = os.getenv("LLM_API_KEY", "")
 MODEL_NAME = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
 
+# Model cascade: small/fast model for per-chunk summaries (map phase),
+# MODEL_NAME for the final condensation (reduce phase)
+MAP_MODEL_NAME = os.getenv("MAP_MODEL_NAME") or MODEL_NAME
+MAP_MAX_TOKENS = int(os.getenv("MAP_MAX_TOKENS", "500"))
+REDUCE_MAX_TOKENS = int(os.getenv("REDUCE_MAX_TOKENS", "500"))
+
 # GitHub Configuration
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_REPO = os.getenv("GITHUB_REPO", "")  # format: "owner/repo"
@@ -21,6 +28,54 @@ GITHUB_DEFAULT_BRANCH = os.getenv("GITHUB_DEFAULT_BRANCH", "main")
 CODERABBIT_API_KEY = os.getenv("CODERABBIT_API_KEY", "")
 CODERABBIT_ENABLED = bool(os.getenv("CODERABBIT_ENABLED", "").lower() in ["1", "true", "yes"])
 
+# Pipeline Memory Limits (per request)
+MAX_PAGE_BYTES = int(os.getenv("MAX_PAGE_BYTES", "2000000"))  # HTML bytes read per source
+MAX_REQUEST_TEXT_CHARS = int(os.getenv("MAX_REQUEST_TEXT_CHARS", "100000"))  # merged cleaned text kept per request
+
+# Crawl Scheduling (per host, AIMD)
+CRAWL_HOST_INITIAL_CONCURRENCY = float(os.getenv("CRAWL_HOST_INITIAL_CONCURRENCY", "2"))
+CRAWL_HOST_MAX_CONCURRENCY = float(os.getenv("CRAWL_HOST_MAX_CONCURRENCY", "8"))
+CRAWL_DEFAULT_BACKOFF = float(os.getenv("CRAWL_DEFAULT_BACKOFF", "10"))  # seconds, when no Retry-After is sent
+CRAWL_MAX_BACKOFF_WAIT = float(os.getenv("CRAWL_MAX_BACKOFF_WAIT", "30"))  # give up on a host backed off longer
+CRAWL_PREFETCH = int(os.getenv("CRAWL_PREFETCH", "3"))  # pages fetched ahead of the clean stage per request
+
+# Tracked Topics Configuration
+TOPIC_STORE_PATH = os.getenv("TOPIC_STORE_PATH", "data/tracked_topics.json")
+
+# Admission Control (per worker)
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "4"))
+ADMISSION_MAX_PER_CLIENT = int(os.getenv("ADMISSION_MAX_PER_CLIENT", "2"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+# Only enable behind a gateway that sets (and overwrites) X-Client-Id itself
+TRUST_CLIENT_ID_HEADER = bool(os.getenv("TRUST_CLIENT_ID_HEADER", "").lower() in ["1", "true", "yes"])
+
+# Shared State (rate limiting, dedup and caching across workers)
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "memory")  # Options: memory, sqlite
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "data/shared_state.db")
+LLM_RATE_LIMIT_PER_MIN = float(os.getenv("LLM_RATE_LIMIT_PER_MIN", "12"))  # aggregate across all workers
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "600"))  # seconds, 0 disables
+
+# Query Similarity Cache (serve cached research for paraphrased queries)
+QUERY_CACHE_THRESHOLD = float(os.getenv("QUERY_CACHE_THRESHOLD", "0.8"))  # cosine similarity, 1.0 = exact only
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "600"))  # seconds, 0 disables
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "512"))
+
+# Response Size
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))  # bytes, smaller responses are sent as-is
+SOURCE_TEXT_TTL = int(os.getenv("SOURCE_TEXT_TTL", "600"))  # seconds per-source cleaned text stays fetchable
+
+# Request Profiling (admin only)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # profiling is disabled while empty
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+
+# Report Rendering
+REPORT_SECTION_LIMIT = int(os.getenv("REPORT_SECTION_LIMIT", "0"))  # chars per text section, 0 = unlimited
+REPORT_COLLAPSE_TEXT = bool(os.getenv("REPORT_COLLAPSE_TEXT", "").lower() in ["1", "true", "yes"])
+REPORT_OUTPUT_DIR = os.getenv("REPORT_OUTPUT_DIR", "")  # also write reports locally while set
+
 # API Endpoints
 APIFY_BASE_URL = "https://api.apify.com/v2"
 GROQ_BASE_URL = "https://api.groq.com/openai/v1"
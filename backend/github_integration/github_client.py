@@ -4,17 +4,101 @@ Handles file creation and updates in GitHub repositories.
 """
 
 import base64
+import json
 import requests
 import logging
-from typing import Optional
+import tempfile
+from typing import Iterable, Optional, Union
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Characters of a str chunk encoded per step, so a large chunk never needs
+# one full UTF-8 copy in memory
+ENCODE_SLICE_CHARS = 48 * 1024
+
+# Request bodies larger than this are spooled to a temporary file
+BODY_SPOOL_BYTES = 1024 * 1024
+
+
+class Base64StreamEncoder:
+    """
+    Incremental base64 encoder writing to a binary file object.
+
+    Bytes that don't fill a complete 3-byte group are carried over to the
+    next chunk, so the output equals base64 of the concatenated input.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self._pending = b""
+
+    def feed(self, chunk: str):
+        for start in range(0, len(chunk), ENCODE_SLICE_CHARS):
+            data = self._pending + chunk[start:start + ENCODE_SLICE_CHARS].encode("utf-8")
+            cut = len(data) - len(data) % 3
+            self.out.write(base64.b64encode(data[:cut]))
+            self._pending = data[cut:]
+
+    def finish(self):
+        self.out.write(base64.b64encode(self._pending))
+        self._pending = b""
+
+
+class _SpooledBody:
+    """
+    Read-only view of a spooled request body with a known length.
+
+    requests sizes file bodies via fileno(), which forces a
+    SpooledTemporaryFile onto disk; exposing only read() and __len__ keeps
+    small bodies in memory and still sends a Content-Length.
+    """
+
+    def __init__(self, spool, length: int):
+        self._spool = spool
+        self._length = length
+
+    def read(self, size: int = -1) -> bytes:
+        return self._spool.read(size)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def close(self):
+        self._spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _put_body(commit_message: str, branch: str, existing_sha: Optional[str],
+              content: Union[str, Iterable[str]]) -> _SpooledBody:
+    """
+    Build the JSON request body, encoding content into it chunk by chunk.
+    Returns a readable body positioned at the start; the caller closes it.
+    """
+    meta = {"message": commit_message, "branch": branch}
+    if existing_sha:
+        meta["sha"] = existing_sha
+    body = tempfile.SpooledTemporaryFile(max_size=BODY_SPOOL_BYTES)
+    # base64 output is JSON-safe, so the content value can be written raw
+    body.write(json.dumps(meta)[:-1].encode("utf-8") + b', "content": "')
+    encoder = Base64StreamEncoder(body)
+    for chunk in ([content] if isinstance(content, str) else content):
+        encoder.feed(chunk)
+    encoder.finish()
+    body.write(b'"}')
+    length = body.tell()
+    body.seek(0)
+    return _SpooledBody(body, length)
+
 
 def create_or_update_file(
     path: str,
-    content: str,
+    content: Union[str, Iterable[str]],
     commit_message: str,
     github_token: str = "",
     github_repo: str = "",
@@ -25,7 +109,8 @@ def create_or_update_file(
     
     Args:
         path (str): File path in the repository (e.g., "reports/research.md")
-        content (str): File content as string
+        content (str | Iterable[str]): File content as a string or an iterable of
+            chunks (e.g. iter_markdown_report), base64-encoded as it is consumed
         commit_message (str): Commit message
         github_token (str): GitHub personal access token
         github_repo (str): Repository in format "owner/repo"
@@ -81,27 +166,15 @@ def create_or_update_file(
         except Exception as e:
             logger.info(f"File does not exist yet, will create new. Error: {str(e)}")
         
-        # Step 2: Encode content to base64
-        content_bytes = content.encode("utf-8")
-        content_base64 = base64.b64encode(content_bytes).decode("utf-8")
-        
-        # Step 3: Build request body
-        body = {
-            "message": commit_message,
-            "content": content_base64,
-            "branch": branch
-        }
-        
-        # Include SHA if file exists (for update)
-        if existing_sha:
-            body["sha"] = existing_sha
-        
-        # Step 4: Create or update file
-        put_response = requests.put(
-            contents_url,
-            headers=headers,
-            json=body
-        )
+        # Step 2: Build request body, encoding content to base64 incrementally
+        # (includes SHA if file exists, for update)
+        with _put_body(commit_message, branch, existing_sha, content) as body:
+            # Step 3: Create or update file (the body is streamed from the file)
+            put_response = requests.put(
+                contents_url,
+                headers={**headers, "Content-Type": "application/json"},
+                data=body
+            )
         
         # Parse response
         if put_response.status_code in [200, 201]:
@@ -1,19 +1,51 @@
 """
 Markdown Report Generator for AutoResearcher AI
 Generates clean, readable Markdown reports from research results.
+
+Reports are rendered as an iterator of chunks (iter_markdown_report) so they
+can be written to a file or base64-encoded for GitHub incrementally, without
+building the whole document as one string.
 """
 
+from datetime import datetime
 
-def generate_markdown_report(query: str, result: dict) -> str:
+TRUNCATED_MARKER = "\n\n... (truncated)"
+
+
+def _limited(text: str, limit: int = None):
+    """Yield text, cut to limit characters with a truncation marker."""
+    if limit and len(text) > limit:
+        yield text[:limit]
+        yield TRUNCATED_MARKER
+    else:
+        yield text
+
+
+def _text_section(title: str, text: str, limit: int = None, collapsed: bool = False):
+    """Yield a '## title' section, optionally inside a collapsed <details> block."""
+    yield f"## {title}\n"
+    if collapsed:
+        yield f"<details>\n<summary>Show {title.lower()}</summary>\n\n"
+    yield from _limited(text, limit)
+    if collapsed:
+        yield "\n\n</details>"
+    yield "\n\n"
+
+
+def iter_markdown_report(query: str, result: dict, section_limit: int = None,
+                         collapse_text: bool = False, generated_at: datetime = None):
     """
-    Generate a Markdown report from research results.
+    Render a Markdown report from research results as an iterator of chunks.
     
     Args:
         query (str): The research query or URL
         result (dict): Research result containing raw, cleaned, summary, sources, and integration_status
+        section_limit (int): Max characters for the summary and cleaned text sections (None: unlimited)
+        collapse_text (bool): Wrap cleaned and raw text in collapsed <details> blocks
+        generated_at (datetime): Timestamp for the footer (default: now)
         
-    Returns:
-        str: Formatted Markdown document
+    Yields:
+        str: Consecutive chunks of the Markdown document
     """
     # Extract data from result
     summary = result.get("summary", "No summary available")
@@ -22,44 +54,68 @@ def generate_markdown_report(query: str, result: dict) -> str:
     sources = result.get("sources", [])
     integration_status = result.get("integration_status", {})
     
-    # Truncate raw data to first 2000 characters
-    raw_truncated = raw[:2000]
-    if len(raw) > 2000:
-        raw_truncated += "\n\n... (truncated)"
-    
-    # Build Markdown document
-    markdown = f"""# AutoResearcher AI Report
-
-## Query
-{query}
+    yield f"# AutoResearcher AI Report\n\n## Query\n{query}\n\n"
+    yield from _text_section("Summary", summary, section_limit)
+    yield from _text_section("Cleaned Text", cleaned, section_limit, collapse_text)
 
-## Summary
-{summary}
-
-## Cleaned Text
-{cleaned}
-
-## Raw Crawl Data (truncated)
-{raw_truncated}
-
-## Sources
-"""
+    # Truncate raw data to first 2000 characters
+    yield from _text_section("Raw Crawl Data (truncated)", raw, 2000, collapse_text)
     
     # Add sources as bullet list
+    yield "## Sources\n"
     if sources:
         for source in sources:
-            markdown += f"- {source}\n"
+            yield f"- {source}\n"
     else:
-        markdown += "- No sources available\n"
+        yield "- No sources available\n"
     
     # Add integration status
-    markdown += "\n## Integration Status\n"
-    markdown += f"- Apify enabled: {integration_status.get('apify_enabled', False)}\n"
-    markdown += f"- LLM enabled: {integration_status.get('llm_enabled', False)}\n"
-    markdown += f"- LLM provider: {integration_status.get('llm_provider', 'none')}\n"
+    yield "\n## Integration Status\n"
+    yield f"- Apify enabled: {integration_status.get('apify_enabled', False)}\n"
+    yield f"- LLM enabled: {integration_status.get('llm_enabled', False)}\n"
+    yield f"- LLM provider: {integration_status.get('llm_provider', 'none')}\n"
     
     # Add generation metadata
-    from datetime import datetime
-    markdown += f"\n---\n*Generated by AutoResearcher AI on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+    generated_at = generated_at or datetime.now()
+    yield f"\n---\n*Generated by AutoResearcher AI on {generated_at.strftime('%Y-%m-%d %H:%M:%S')}*\n"
+
+
+def generate_markdown_report(query: str, result: dict) -> str:
+    """
+    Generate a Markdown report from research results.
+    
+    Args:
+        query (str): The research query or URL
+        result (dict): Research result containing raw, cleaned, summary, sources, and integration_status
+        
+    Returns:
+        str: Formatted Markdown document
+    """
+    return "".join(iter_markdown_report(query, result))
+
+
+def report_preview(chunks, max_chars: int = 2000) -> str:
+    """Collect only the first max_chars characters of a chunk iterator."""
+    parts = []
+    remaining = max_chars
+    for chunk in chunks:
+        parts.append(chunk[:remaining])
+        remaining -= len(parts[-1])
+        if remaining <= 0:
+            break
+    return "".join(parts)
+
+
+def write_markdown_report(path: str, chunks) -> int:
+    """
+    Write report chunks to a file as they are rendered.
     
-    return markdown
+    Returns:
+        int: Number of characters written
+    """
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    return written
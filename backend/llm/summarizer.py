@@ -1,7 +1,7 @@
 import requests
-import time
 import random
-from config import LLM_PROVIDER, LLM_API_KEY, MODEL_NAME, GROQ_BASE_URL, OPENAI_BASE_URL, GEMINI_BASE_URL
+from config import LLM_PROVIDER, LLM_API_KEY, MODEL_NAME, MAP_MODEL_NAME, MAP_MAX_TOKENS, REDUCE_MAX_TOKENS, LLM_RATE_LIMIT_PER_MIN, GROQ_BASE_URL, OPENAI_BASE_URL, GEMINI_BASE_URL
+from utils.shared_state import get_shared_state
 
 
 class Summarizer:
@@ -10,33 +10,50 @@ class Summarizer:
     Supports multiple providers: Groq, OpenAI, Gemini.
     """
     
-    def __init__(self):
+    def __init__(self, shared_state=None):
         self.provider = LLM_PROVIDER.lower()
         self.api_key = LLM_API_KEY
         self.model = MODEL_NAME
+        self.max_tokens = REDUCE_MAX_TOKENS
+
+        # Map phase (per-chunk) stage configuration
+        self.map_model = MAP_MODEL_NAME
+        self.map_max_tokens = MAP_MAX_TOKENS
+
+        # Rate limit shared by all workers (replaces per-request sleeps)
+        self.shared_state = shared_state or get_shared_state()
+        self.rate_limit_per_min = LLM_RATE_LIMIT_PER_MIN
         
+        # Keep-alive connection pool to the LLM provider
+        self.session = requests.Session()
+
         # Set base URL based on provider
         self.base_urls = {
             "groq": GROQ_BASE_URL,
             "openai": OPENAI_BASE_URL,
             "gemini": GEMINI_BASE_URL
         }
+
+    def _throttle(self):
+        """Wait for a slot of the cross-worker LLM rate limit."""
+        self.shared_state.throttle("llm", self.rate_limit_per_min)
     
-    def summarize_with_groq(self, text):
+    def summarize_with_groq(self, text, model=None, max_tokens=None):
         """Summarize text using Groq API with rate limit retries."""
         max_retries = 3
         base_delay = 5  # Increased from 2 to 5 for stability
         
         for attempt in range(max_retries + 1):
+            self._throttle()
             try:
                 payload = {
-                    "model": self.model,
+                    "model": model or self.model,
                     "messages": [
                         {"role": "system", "content": "You are a concise research summarizer. Provide clear, factual summaries."},
                         {"role": "user", "content": text[:4000]}
                     ],
                     "temperature": 0.7,
-                    "max_tokens": 500
+                    "max_tokens": max_tokens or self.max_tokens
                 }
 
                 headers = {
@@ -44,7 +61,7 @@ class Summarizer:
                     "Content-Type": "application/json"
                 }
 
-                response = requests.post(
+                response = self.session.post(
                     "https://api.groq.com/openai/v1/chat/completions",
                     json=payload,
                     headers=headers,
@@ -60,7 +77,8 @@ class Summarizer:
                     if attempt < max_retries:
                         delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
                         print(f"[Groq] Rate limit hit (429). Retrying in {delay:.2f}s...")
-                        time.sleep(delay)
+                        # Back off every worker, not just this request
+                        self.shared_state.penalize("llm", delay)
                         continue
                     else:
                         print(f"[Groq Error] Rate limit exceeded after {max_retries} retries.")
@@ -71,7 +89,7 @@ class Summarizer:
             except Exception as e:
                 return f"Summary unavailable (error: {str(e)}): {text[:200]}"
     
-    def summarize_with_openai(self, text):
+    def summarize_with_openai(self, text, model=None, max_tokens=None):
         """Summarize text using OpenAI API."""
         url = f"{self.base_urls['openai']}/chat/completions"
         headers = {
@@ -79,7 +97,7 @@ class Summarizer:
             "Content-Type": "application/json"
         }
         payload = {
-            "model": self.model,
+            "model": model or self.model,
             "messages": [
                 {
                     "role": "system",
@@ -91,18 +109,19 @@ class Summarizer:
                 }
             ],
             "temperature": 0.7,
-            "max_tokens": 500
+            "max_tokens": max_tokens or self.max_tokens
         }
         
-        response = requests.post(url, json=payload, headers=headers)
+        self._throttle()
+        response = self.session.post(url, json=payload, headers=headers)
         response.raise_for_status()
         
         result = response.json()
         return result["choices"][0]["message"]["content"]
     
-    def summarize_with_gemini(self, text):
+    def summarize_with_gemini(self, text, model=None, max_tokens=None):
         """Summarize text using Google Gemini API."""
-        url = f"{self.base_urls['gemini']}/models/{self.model}:generateContent"
+        url = f"{self.base_urls['gemini']}/models/{model or self.model}:generateContent"
         headers = {
             "Content-Type": "application/json"
         }
@@ -117,22 +136,25 @@ class Summarizer:
             }],
             "generationConfig": {
                 "temperature": 0.7,
-                "maxOutputTokens": 500
+                "maxOutputTokens": max_tokens or self.max_tokens
             }
         }
         
-        response = requests.post(url, json=payload, headers=headers, params=params)
+        self._throttle()
+        response = self.session.post(url, json=payload, headers=headers, params=params)
         response.raise_for_status()
         
         result = response.json()
         return result["candidates"][0]["content"]["parts"][0]["text"]
     
-    def summarize(self, text):
+    def summarize(self, text, model=None, max_tokens=None):
         """
         Summarize the given text using the configured LLM provider.
         
         Args:
             text (str): The text to summarize
+            model (str): Model override (default: MODEL_NAME)
+            max_tokens (int): Output token limit override (default: REDUCE_MAX_TOKENS)
             
         Returns:
             str: AI-generated summary
@@ -152,11 +174,11 @@ class Summarizer:
         try:
             # Call appropriate provider
             if self.provider == "groq":
-                return self.summarize_with_groq(text)
+                return self.summarize_with_groq(text, model, max_tokens)
             elif self.provider == "openai":
-                return self.summarize_with_openai(text)
+                return self.summarize_with_openai(text, model, max_tokens)
             elif self.provider == "gemini":
-                return self.summarize_with_gemini(text)
+                return self.summarize_with_gemini(text, model, max_tokens)
             else:
                 return f"Summary unavailable (unknown provider '{self.provider}'): {text[:200]}..."
                 
@@ -169,51 +191,42 @@ class Summarizer:
             else:
                 return error_msg + text
 
-    def summarize_multi_source(self, text, provider="groq"):
-        """
-        Summarize merged text from multiple sources using chunking.
-        Handles large inputs by splitting, summarizing chunks, and condensing.
-        """
-        if not text or len(text.strip()) == 0:
-            return "No content available"
+    # Chunk size (Groq max safe input ~3500 chars)
+    CHUNK_SIZE = 3000
+    # Cap on chunks per run to avoid Rate Limits (429)
+    MAX_CHUNKS = 5
 
-        print(f"[MultiSource] Summarizing text of length {len(text)}...")
+    def split_chunks(self, text):
+        """Split text into fixed-size chunks for the map phase (uncapped)."""
+        return [text[i:i+self.CHUNK_SIZE] for i in range(0, len(text), self.CHUNK_SIZE)]
 
-        # Chunk size (Groq max safe input ~3500 chars)
-        CHUNK_SIZE = 3000
+    def summarize_chunk(self, chunk):
+        """
+        Map phase: summarize a single chunk with the small map model.
+        Falls back to the large model if the map model errors.
+        Returns None if the LLM call failed, so callers can skip the chunk
+        (and tracked topics retry it on the next refresh).
+        """
+        try:
+            summary = self.summarize(chunk, model=self.map_model, max_tokens=self.map_max_tokens)
 
-        chunks = [text[i:i+CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)]
-        
-        # --- HACKATHON STABILITY FIX ---
-        # Cap at 5 chunks to avoid Rate Limits (429) during demo
-        if len(chunks) > 5:
-            print(f"[MultiSource] Capping chunks from {len(chunks)} to 5 for stability.")
-            chunks = chunks[:5]
-        # -------------------------------
-        
-        print(f"[MultiSource] Split into {len(chunks)} chunks")
+            if self.map_model != self.model and summary.startswith(("Summary unavailable (error:", "Summary unavailable (rate limit)")):
+                print(f"[MultiSource] Map model {self.map_model} failed, falling back to {self.model}")
+                summary = self.summarize(chunk, model=self.model, max_tokens=self.map_max_tokens)
 
-        partial_summaries = []
-        for idx, chunk in enumerate(chunks):
-            # Proactive delay to avoid rate limits
-            if idx > 0:
-                time.sleep(5)  # Increased from 2s to 5s
+            # Check if summarize() returned an error, rate limit or no-key string
+            if summary.startswith("Summary unavailable"):
+                print(f"[MultiSource] Chunk summary failed: {summary}")
+                return None
 
-            try:
-                print(f"[MultiSource] Summarizing chunk {idx+1}/{len(chunks)}...")
-                summary = self.summarize(chunk)
-                
-                # Check if summarize() returned an error string
-                if summary.startswith("Summary unavailable (error:"):
-                    print(f"[MultiSource] Chunk summary failed: {summary}")
-                    continue
-                    
-                partial_summaries.append(summary)
-            except Exception as e:
-                print(f"[MultiSource] Error summarizing chunk {idx}: {e}")
-                # Skip failed chunks to avoid polluting the summary with error strings
-                pass
+            return summary
+        except Exception as e:
+            print(f"[MultiSource] Error summarizing chunk: {e}")
+            # Skip failed chunks to avoid polluting the summary with error strings
+            return None
 
+    def reduce_summaries(self, partial_summaries):
+        """Reduce phase: condense partial summaries into the final overview."""
         # Combine partial summaries
         combined = "\n\n".join(partial_summaries)
         print(f"[MultiSource] Combined partial summaries length: {len(combined)}")
@@ -237,3 +250,34 @@ class Summarizer:
         except Exception as e:
             print(f"[MultiSource] Final summary failed: {e}")
             return combined  # fallback to partials without error text
+
+    def summarize_multi_source(self, text, provider="groq"):
+        """
+        Summarize merged text from multiple sources using chunking.
+        Handles large inputs by splitting, summarizing chunks, and condensing.
+        """
+        if not text or len(text.strip()) == 0:
+            return "No content available"
+
+        print(f"[MultiSource] Summarizing text of length {len(text)}...")
+
+        chunks = self.split_chunks(text)
+        
+        # --- HACKATHON STABILITY FIX ---
+        # Cap at 5 chunks to avoid Rate Limits (429) during demo
+        if len(chunks) > self.MAX_CHUNKS:
+            print(f"[MultiSource] Capping chunks from {len(chunks)} to {self.MAX_CHUNKS} for stability.")
+            chunks = chunks[:self.MAX_CHUNKS]
+        # -------------------------------
+        
+        print(f"[MultiSource] Split into {len(chunks)} chunks")
+
+        partial_summaries = []
+        for idx, chunk in enumerate(chunks):
+            # Pacing between chunks is handled by the shared LLM rate limit
+            print(f"[MultiSource] Summarizing chunk {idx+1}/{len(chunks)}...")
+            summary = self.summarize_chunk(chunk)
+            if summary is not None:
+                partial_summaries.append(summary)
+
+        return self.reduce_summaries(partial_summaries)
@@ -1,20 +1,52 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
+from datetime import datetime
+import hmac
 import logging
+import os
+import threading
+import uuid
 
-# Import our modules
-from apify_agent.crawler import WebCrawler
-from utils.cleaner import clean_text
-from llm.summarizer import Summarizer
-from config import APIFY_API_TOKEN, LLM_PROVIDER, LLM_API_KEY, GITHUB_TOKEN, GITHUB_REPO, GITHUB_DEFAULT_BRANCH, CODERABBIT_ENABLED
+# Import our modules (heavy dependencies load lazily, see components.py)
+from components import crawler, summarizer, topic_tracker, query_cache, warm_up, warmup_status
+from utils.pipeline import run_pipeline
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.shared_state import get_shared_state
+from utils.profiler import SamplingProfiler
+from config import (
+    APIFY_API_TOKEN, LLM_PROVIDER, LLM_API_KEY, GITHUB_TOKEN, GITHUB_REPO, GITHUB_DEFAULT_BRANCH, CODERABBIT_ENABLED,
+    ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_PER_CLIENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT,
+    TRUST_CLIENT_ID_HEADER,
+    RESULT_CACHE_TTL, QUERY_CACHE_TTL, MAX_REQUEST_TEXT_CHARS,
+    COMPRESSION_MIN_SIZE, SOURCE_TEXT_TTL, ADMIN_TOKEN, PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_TOP_N,
+    CRAWL_PREFETCH, REPORT_SECTION_LIMIT, REPORT_COLLAPSE_TEXT, REPORT_OUTPUT_DIR
+)
+
+# Brotli is optional; fall back to gzip if brotli-asgi is not installed
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AutoResearcher AI API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build components in the background so startup is not blocked."""
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="AutoResearcher AI API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -25,14 +57,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize pipeline components
-crawler = WebCrawler()
-summarizer = Summarizer()
+# Compress large responses (research payloads are mostly text)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# Cached results carry a research_id, so its source texts must outlive both
+# caches (plus a margin for the time between storing them and caching the result)
+SOURCE_TEXT_LIFETIME = max(SOURCE_TEXT_TTL, RESULT_CACHE_TTL, QUERY_CACHE_TTL) + 60
+
+# Initialize request-scoped helpers (pipeline components are in components.py)
+profiler = SamplingProfiler(PROFILE_DIR, interval=PROFILE_INTERVAL_MS / 1000, top_n=PROFILE_TOP_N)
+
+# Limit concurrent pipelines (crawl + LLM fan-out) per worker
+admission = AdmissionController(
+    max_concurrent=ADMISSION_MAX_CONCURRENT,
+    max_per_client=ADMISSION_MAX_PER_CLIENT,
+    max_queue=ADMISSION_MAX_QUEUE,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT
+)
+
+
+def client_id(request: Request) -> str:
+    """
+    Identify the caller for per-client limits: the client IP, or the
+    X-Client-Id header if TRUST_CLIENT_ID_HEADER says a gateway sets it.
+    """
+    if TRUST_CLIENT_ID_HEADER and request.headers.get("X-Client-Id"):
+        return request.headers["X-Client-Id"]
+    return request.client.host if request.client else "unknown"
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    logger.warning(f"Admission rejected ({exc.reason}) for {client_id(request)}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.reason, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 
 # Request models
 class ResearchRequest(BaseModel):
     query: str
+    fresh: bool = False  # skip caches and force a new pipeline run
 
 
 # Response models
@@ -49,6 +119,75 @@ class ResearchResponse(BaseModel):
     integration_status: dict = {}
 
 
+def require_admin(request: Request):
+    """Reject callers without a valid X-Admin-Token (disabled if ADMIN_TOKEN is unset)."""
+    token = request.headers.get("X-Admin-Token", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def profiling_requested(request: Request) -> bool:
+    """
+    Opt-in profiling via X-Profile header or ?profile= flag, admins only.
+    Call at the top of a handler so a non-admin gets 403 before any cache
+    lookup or admission slot.
+    """
+    flag = request.headers.get("X-Profile") or request.query_params.get("profile")
+    if not flag or flag.lower() not in ("1", "true", "yes"):
+        return False
+    require_admin(request)
+    return True
+
+
+async def run_blocking(request: Request, profile: bool, fn, *args):
+    """
+    Run a blocking pipeline call in the threadpool. If profile is set (see
+    profiling_requested), sample that thread and report the profile id in
+    X-Profile-Id.
+    """
+    if not profile:
+        return await run_in_threadpool(fn, *args)
+
+    response, profile = await run_in_threadpool(profiler.run, fn, *args)
+    logger.info(f"Profiled {request.url.path}: {profile['samples']} samples, id {profile['profile_id']}")
+    response.headers["X-Profile-Id"] = profile["profile_id"]
+    return response
+
+
+# Top-level response fields that ?fields= may select
+RESEARCH_FIELDS = ("status", "research_id", "summary", "merged_cleaned", "sources",
+                   "integration_status", "pipeline", "cache")
+REPORT_FIELDS = ("status", "query", "file_path", "github", "coderabbit", "local_path", "preview")
+
+
+def parse_fields(fields: Optional[str], allowed: tuple) -> Optional[List[str]]:
+    """
+    Parse ?fields=summary,sources. Unknown fields are rejected with 400
+    before any pipeline work or admission slot is spent on the request.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}"
+        )
+    return requested or None
+
+
+def project_fields(payload: dict, requested: Optional[List[str]]) -> JSONResponse:
+    """
+    Keep only the requested top-level fields (plus "status"). Returns a
+    JSONResponse directly, skipping FastAPI's jsonable_encoder pass since
+    payloads are plain JSON types.
+    """
+    if requested:
+        payload = {"status": payload.get("status", "ok"), **{f: payload.get(f) for f in requested}}
+    return JSONResponse(content=payload)
+
+
 @app.get("/")
 async def root():
     return {"message": "AutoResearcher AI API"}
@@ -59,57 +198,147 @@ async def health_check():
     return {"status": "healthy", "message": "pong"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once warm-up has built every component, else 503."""
+    body = {
+        "status": warmup_status["state"],
+        "warmup_seconds": warmup_status["seconds"],
+        "components": {c.name: c.ready for c in (crawler, summarizer, topic_tracker, query_cache)}
+    }
+    if warmup_status["error"]:
+        body["error"] = warmup_status["error"]
+    return JSONResponse(status_code=200 if warmup_status["state"] == "ready" else 503, content=body)
+
+
+@app.get("/admission/stats")
+async def admission_stats():
+    """Current pipeline concurrency, queue depth and rejection counts."""
+    return {"status": "ok", **admission.stats()}
+
+
+@app.get("/crawler/stats")
+async def crawler_stats():
+    """Per-host crawl concurrency limits, latency, error rate and backoff."""
+    # Don't build the crawler on the event loop; before warm-up nothing was crawled
+    if not crawler.ready:
+        return {"status": "ok", "hosts": {}}
+    return {"status": "ok", "hosts": crawler.get().scheduler.stats()}
+
+
 @app.post("/research")
-async def research_topic(request: ResearchRequest):
+async def research_topic(request: ResearchRequest, http_request: Request, fields: Optional[str] = None):
     """
     Multi-source research pipeline:
     1. Search & Collect URLs (DuckDuckGo Lite)
     2. Crawl 5 sources (Requests + BS4)
     3. Clean & Merge texts
     4. Summarize unified text
+
+    Use ?fields=summary,sources to return only some fields; per-source
+    cleaned text can be fetched lazily from /research/{research_id}/sources/{index}.
     """
     query = request.query
+    requested_fields = parse_fields(fields, RESEARCH_FIELDS)
+    profile = profiling_requested(http_request)
     logger.info(f"Researching: {query}")
-    
+
+    # Paraphrase hits skip admission entirely; they cost no crawl or LLM call
+    # (nothing can be cached before the query cache has been built)
+    if not request.fresh and QUERY_CACHE_TTL > 0 and query_cache.ready:
+        # Off the event loop: a lookup can rebuild the matrix after expiry
+        match = await run_in_threadpool(query_cache.get().lookup, query)
+        if match:
+            logger.info(f"Query cache hit ({match['score']}): '{query}' ~ '{match['matched_query']}'")
+            cache_info = {"hit": True, "score": match["score"], "matched_query": match["matched_query"]}
+            return project_fields({**match["result"], "cache": cache_info}, requested_fields)
+
+    # Projection and JSON encoding run in the threadpool so profiles include them
+    async with admission.slot(client_id(http_request)):
+        return await run_blocking(
+            http_request,
+            profile,
+            lambda: project_fields(cached_research_pipeline(query, request.fresh), requested_fields)
+        )
+
+
+@app.get("/research/{research_id}/sources/{index}")
+async def research_source_text(research_id: str, index: int):
+    """Lazily fetch the cleaned text of one source from a recent /research run."""
+    source_texts = await run_in_threadpool(get_shared_state().cache_get, f"sources:{research_id}")
+    if source_texts is None:
+        raise HTTPException(status_code=404, detail=f"Research run not found or expired: {research_id}")
+    if index < 0 or index >= len(source_texts):
+        raise HTTPException(status_code=404, detail=f"Source index out of range (0-{len(source_texts) - 1})")
+
+    return {
+        "status": "ok",
+        "research_id": research_id,
+        "index": index,
+        **source_texts[index]
+    }
+
+
+def cached_research_pipeline(query: str, fresh: bool = False) -> dict:
+    """
+    Serve a cached result if any worker computed this query recently.
+    Identical in-flight queries wait for the first one instead of re-running.
+    """
+    key = "research:" + " ".join(query.lower().split())
+    # Rate limits, in-flight dedup and result caches shared across workers
+    shared_state = get_shared_state()
+    cache_info = {"hit": False, "score": None, "matched_query": None}
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return run_research_pipeline(query)
+
+    if fresh:
+        result = compute()
+        if RESULT_CACHE_TTL > 0:
+            shared_state.cache_set(key, result, RESULT_CACHE_TTL)
+    else:
+        cached = shared_state.cache_get(key)
+        if cached is not None:
+            result = cached
+            cache_info = {"hit": True, "score": 1.0, "matched_query": query}
+        else:
+            result = shared_state.get_or_compute(key, compute, ttl=RESULT_CACHE_TTL)
+
+    # Only fresh results go into the query cache, so its TTL counts from the
+    # pipeline run (re-adding a cached result would extend its lifetime)
+    if computed and QUERY_CACHE_TTL > 0:
+        query_cache.get().add(query, result)
+    return {**result, "cache": cache_info}
+
+
+def run_research_pipeline(query: str) -> dict:
+    """Blocking research pipeline, run in the threadpool."""
     try:
         # Step A: Search for URLs
-        urls = crawler.search_top_urls(request.query)
+        urls = crawler.get().search_top_urls(query)
         print(f"[MultiSource] Using URLs: {urls}")
 
-        # Step B: Crawl each URL
-        raw_pages = {}
-        for u in urls:
-            raw_text = crawler.crawl_url(u)
-            raw_pages[u] = raw_text
-            
-        # Step C: Clean & Merge
-        merged_cleaned = ""
-        for src, raw in raw_pages.items():
-            cleaned = clean_text(raw)
-            merged_cleaned += f"\n\n--- SOURCE: {src} ---\n{cleaned}\n"
-        
-        # Step D: Summarize
-        # We need to use the multi-source summarizer method if it exists, or just summarize
-        # The prompt asked to use "summarize_multi_source" in Phase 16, but didn't explicitly mention it in this "DuckDuckGo Lite" update prompt.
-        # However, since we are doing multi-source, we should probably use the multi-source summarizer if available.
-        # Let's check if Summarizer has summarize_multi_source. It should from previous steps.
-        # If not, we fall back to summarize.
-        
-        if hasattr(summarizer, 'summarize_multi_source'):
-            summary = summarizer.summarize_multi_source(merged_cleaned)
-        else:
-            summary = summarizer.summarize(merged_cleaned)
+        # Steps B-D: Crawl -> Clean -> Chunk -> Summarize, a bounded window of pages in memory
+        result = run_pipeline(crawler.get(), summarizer.get(), urls, MAX_REQUEST_TEXT_CHARS, CRAWL_PREFETCH)
+
+        # Keep per-source cleaned text for lazy fetching
+        research_id = uuid.uuid4().hex
+        get_shared_state().cache_set(f"sources:{research_id}", result["source_texts"], SOURCE_TEXT_LIFETIME)
         
         return {
             "status": "ok",
-            "summary": summary,
-            "merged_cleaned": merged_cleaned,
-            "sources": list(raw_pages.keys()),
+            "research_id": research_id,
+            "summary": result["summary"],
+            "merged_cleaned": result["merged_cleaned"],
+            "sources": result["sources"],
             "integration_status": {
                 "apify_enabled": False,
                 "llm_enabled": True,
                 "llm_provider": LLM_PROVIDER
-            }
+            },
+            "pipeline": result["stats"]
         }
 
     except Exception as e:
@@ -138,18 +367,29 @@ def slugify(text: str) -> str:
 
 
 @app.post("/github/report")
-async def github_report(request: GitHubReportRequest):
+async def github_report(request: GitHubReportRequest, http_request: Request, fields: Optional[str] = None):
     """
     Generate research report and export to GitHub.
+    Use ?fields=github,file_path to drop the Markdown preview.
     """
-    from github_integration.report_generator import generate_markdown_report
+    requested_fields = parse_fields(fields, REPORT_FIELDS)
+    profile = profiling_requested(http_request)
+    async with admission.slot(client_id(http_request)):
+        return await run_blocking(
+            http_request,
+            profile,
+            lambda: project_fields(run_github_report(request.query, request.file_path), requested_fields)
+        )
+
+
+def run_github_report(query: str, requested_path: Optional[str] = None) -> dict:
+    """Blocking report pipeline, run in the threadpool."""
+    from github_integration.report_generator import iter_markdown_report, report_preview, write_markdown_report
     from github_integration.github_client import create_or_update_file
     
-    query = request.query
-    
     # Determine file path
-    if request.file_path:
-        file_path = request.file_path
+    if requested_path:
+        file_path = requested_path
     else:
         # Generate filename from query
         slug = slugify(query)
@@ -159,32 +399,17 @@ async def github_report(request: GitHubReportRequest):
     
     try:
         # Re-run pipeline logic for report
-        urls = crawler.search_top_urls(query)
-        raw_pages = {}
-        for u in urls:
-            raw_text = crawler.crawl_url(u)
-            raw_pages[u] = raw_text
-            
-        merged_cleaned = ""
-        cleaned_pages = {}
-        for src, raw in raw_pages.items():
-            cleaned = clean_text(raw)
-            merged_cleaned += f"\n\n--- SOURCE: {src} ---\n{cleaned}\n"
-            cleaned_pages[src] = cleaned
-            
-        if hasattr(summarizer, 'summarize_multi_source'):
-            summary_text = summarizer.summarize_multi_source(merged_cleaned)
-        else:
-            summary_text = summarizer.summarize(merged_cleaned)
+        urls = crawler.get().search_top_urls(query)
+        result = run_pipeline(crawler.get(), summarizer.get(), urls, MAX_REQUEST_TEXT_CHARS, CRAWL_PREFETCH)
         
-        # Build result dict for report generator
-        # Adapting to match what report generator might expect
+        # Build result dict for report generator from per-source excerpts
+        # (raw pages are released during the pipeline)
         sources_list = []
-        for url, raw in raw_pages.items():
+        for excerpt in result["excerpts"]:
             sources_list.append({
-                "url": url,
-                "raw": raw[:500] + "...",
-                "cleaned": cleaned_pages.get(url, "")[:500] + "..."
+                "url": excerpt["url"],
+                "raw": excerpt["raw"] + "...",
+                "cleaned": excerpt["cleaned"] + "..."
             })
 
         integration_status = {
@@ -195,22 +420,41 @@ async def github_report(request: GitHubReportRequest):
         
         result_dict = {
             "status": "ok",
-            "raw": str(raw_pages), 
-            "cleaned": merged_cleaned,
-            "summary": summary_text,
+            "raw": "\n\n".join(f"{e['url']}: {e['raw']}" for e in result["excerpts"]),
+            "cleaned": result["merged_cleaned"],
+            "summary": result["summary"],
             "sources": sources_list,
             "integration_status": integration_status
         }
         
-        # Step 2: Generate Markdown report
-        logger.info("Generating Markdown report...")
-        markdown_content = generate_markdown_report(query, result_dict)
+        # Step 2: Render the Markdown report lazily; each consumer pulls a fresh
+        # iterator, so the full document is never held as one string
+        generated_at = datetime.now()
+
+        def render():
+            return iter_markdown_report(
+                query, result_dict,
+                section_limit=REPORT_SECTION_LIMIT or None,
+                collapse_text=REPORT_COLLAPSE_TEXT,
+                generated_at=generated_at
+            )
+
+        local_path = None
+        if REPORT_OUTPUT_DIR:
+            # file_path may come from the request; keep it inside the output dir
+            output_root = os.path.abspath(REPORT_OUTPUT_DIR)
+            local_path = os.path.abspath(os.path.join(output_root, file_path.lstrip("/\\")))
+            if os.path.commonpath([output_root, local_path]) != output_root:
+                raise HTTPException(status_code=400, detail="file_path escapes the report output directory")
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            write_markdown_report(local_path, render())
+            logger.info(f"Wrote Markdown report to {local_path}")
         
-        # Step 3: Attempt GitHub commit
+        # Step 3: Attempt GitHub commit (content is base64-encoded as it streams)
         logger.info("Attempting GitHub commit...")
         github_result = create_or_update_file(
             path=file_path,
-            content=markdown_content,
+            content=render(),
             commit_message=f"Add research report for: {query}",
             github_token=GITHUB_TOKEN,
             github_repo=GITHUB_REPO,
@@ -233,13 +477,16 @@ async def github_report(request: GitHubReportRequest):
                 "enabled": CODERABBIT_ENABLED,
                 "note": "If CodeRabbit is installed on this repo, future pull requests that modify this report will be auto-reviewed."
             },
+            "local_path": local_path,
             "preview": {
-                "markdown": markdown_content[:2000]
+                "markdown": report_preview(render(), 2000)
             }
         }
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"GitHub report failed: {str(e)}")
         raise HTTPException(
@@ -248,6 +495,90 @@ async def github_report(request: GitHubReportRequest):
         )
 
 
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, http_request: Request, format: str = "json"):
+    """
+    Fetch a stored request profile (admins only).
+    format=json returns the top-N hot-function table, format=folded returns
+    folded stacks for flamegraph.pl / speedscope.
+    """
+    require_admin(http_request)
+    folded = format == "folded"
+    profile = profiler.load(profile_id, folded=folded)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    if folded:
+        return PlainTextResponse(profile)
+    return {"status": "ok", **profile}
+
+
+# Request model for tracked topics
+class TrackTopicRequest(BaseModel):
+    query: str
+
+
+@app.get("/topics")
+async def list_topics():
+    """List tracked research topics."""
+    topics = await run_in_threadpool(lambda: topic_tracker.get().list_topics())
+    return {"status": "ok", "topics": topics}
+
+
+@app.post("/topics")
+async def track_topic(request: TrackTopicRequest, http_request: Request):
+    """
+    Start tracking a research topic and run its first full refresh.
+    Later refreshes only re-summarize sources that changed.
+    """
+    topic_id = slugify(request.query)
+    logger.info(f"Tracking topic: {request.query}")
+
+    async with admission.slot(client_id(http_request)):
+        try:
+            topic = await run_in_threadpool(lambda: topic_tracker.get().track(topic_id, request.query))
+        except Exception as e:
+            logger.error(f"Topic tracking failed: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Topic tracking failed: {str(e)}"
+            )
+    return {"status": "ok", **topic}
+
+
+@app.post("/topics/{topic_id}/refresh")
+async def refresh_topic(topic_id: str, http_request: Request):
+    """
+    Incrementally refresh a tracked topic:
+    1. Re-crawl sources conditionally (ETag / Last-Modified)
+    2. Re-summarize only chunks whose text changed
+    3. Re-run the final reduce only if a partial summary changed
+    """
+    if await run_in_threadpool(lambda: topic_tracker.get().get_topic(topic_id)) is None:
+        raise HTTPException(status_code=404, detail=f"Topic not tracked: {topic_id}")
+
+    async with admission.slot(client_id(http_request)):
+        try:
+            topic = await run_in_threadpool(lambda: topic_tracker.get().refresh(topic_id))
+        except KeyError:
+            # Untracked while the refresh was queued or running
+            raise HTTPException(status_code=404, detail=f"Topic not tracked: {topic_id}")
+        except Exception as e:
+            logger.error(f"Topic refresh failed: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Topic refresh failed: {str(e)}"
+            )
+    return {"status": "ok", **topic}
+
+
+@app.delete("/topics/{topic_id}")
+async def untrack_topic(topic_id: str):
+    """Stop tracking a topic and drop its stored hashes and summaries."""
+    if not await run_in_threadpool(lambda: topic_tracker.get().untrack(topic_id)):
+        raise HTTPException(status_code=404, detail=f"Topic not tracked: {topic_id}")
+    return {"status": "ok", "topic_id": topic_id}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1 @@
+# Tracking Module
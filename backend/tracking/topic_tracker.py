@@ -0,0 +1,242 @@
+"""
+Tracked Topics for AutoResearcher AI
+Stores per-source content hashes and per-chunk partial summaries so that
+scheduled refreshes only re-summarize what actually changed.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+from utils.cleaner import clean_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _hash(text: str) -> str:
+    """Stable content hash used for change detection."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TopicTracker:
+    """
+    Incremental research runner for recurring topics.
+
+    Each tracked topic keeps, per source URL, the HTTP validators (ETag /
+    Last-Modified), a hash of the cleaned text and the partial summary of
+    every chunk. A refresh re-crawls conditionally, re-summarizes only
+    chunks whose text changed, and re-runs the reduce step only if the
+    list of partial summaries changed.
+    """
+
+    def __init__(self, crawler, summarizer, store_path: str):
+        self.crawler = crawler
+        self.summarizer = summarizer
+        self.store_path = store_path
+        # _lock guards the topic store only; crawl and LLM work runs outside it
+        # under a per-topic lock so refreshes of one topic don't interleave
+        self._lock = threading.Lock()
+        self._topic_locks = {}
+        self._topics = self._load()
+
+    # --- Persistence ---
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.store_path):
+            return {}
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Could not load topic store {self.store_path}: {str(e)}")
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.store_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.store_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._topics, f)
+        os.replace(tmp_path, self.store_path)
+
+    # --- Public API ---
+
+    def list_topics(self) -> list:
+        with self._lock:
+            return [self._describe(topic_id, topic) for topic_id, topic in self._topics.items()]
+
+    def get_topic(self, topic_id: str):
+        with self._lock:
+            topic = self._topics.get(topic_id)
+            return self._describe(topic_id, topic) if topic else None
+
+    def track(self, topic_id: str, query: str) -> dict:
+        """Start tracking a topic and run its first (full) refresh."""
+        with self._lock:
+            known = topic_id in self._topics
+        if not known:
+            urls = self.crawler.search_top_urls(query)
+            with self._lock:
+                self._topics.setdefault(topic_id, {
+                    "query": query,
+                    "urls": urls,
+                    "sources": {},
+                    "partials_hash": None,
+                    "summary": None,
+                    "updated_at": None
+                })
+                self._save()
+        return self.refresh(topic_id)
+
+    def untrack(self, topic_id: str) -> bool:
+        with self._lock:
+            if topic_id not in self._topics:
+                return False
+            del self._topics[topic_id]
+            self._topic_locks.pop(topic_id, None)
+            self._save()
+            return True
+
+    def refresh(self, topic_id: str) -> dict:
+        """
+        Incrementally refresh a tracked topic.
+
+        Returns the topic description plus a "refresh" block with the number
+        of LLM calls made and which sources changed. A refresh of an
+        unchanged topic makes zero LLM calls.
+        """
+        with self._topic_lock(topic_id):
+            # Work on a snapshot so the store lock is not held during I/O
+            with self._lock:
+                topic = self._topics.get(topic_id)
+                if topic is None:
+                    raise KeyError(topic_id)
+                topic = copy.deepcopy(topic)
+
+            stats = {
+                "changed_sources": [],
+                "unchanged_sources": [],
+                "failed_sources": [],
+                "chunks_total": 0,
+                "chunks_summarized": 0,
+                "reduce_ran": False,
+                "llm_calls": 0
+            }
+
+            # Step A: Conditional re-crawl, detect changed sources
+            for url in topic["urls"]:
+                previous = topic["sources"].get(url, {})
+                fetched = self.crawler.crawl_url_conditional(
+                    url,
+                    etag=previous.get("etag"),
+                    last_modified=previous.get("last_modified")
+                )
+
+                if fetched["status"] == "error":
+                    # Keep stale chunks rather than dropping the source
+                    stats["failed_sources"].append(url)
+                    continue
+
+                if fetched["status"] == "not_modified":
+                    stats["unchanged_sources"].append(url)
+                    continue
+
+                cleaned = clean_text(fetched["text"])
+                content_hash = _hash(cleaned)
+                if previous.get("content_hash") == content_hash:
+                    stats["unchanged_sources"].append(url)
+                else:
+                    stats["changed_sources"].append(url)
+
+                topic["sources"][url] = {
+                    "etag": fetched["etag"],
+                    "last_modified": fetched["last_modified"],
+                    "content_hash": content_hash,
+                    "chunks": self._diff_chunks(cleaned, previous.get("chunks", []))
+                }
+
+            # Step B: Map phase, only for chunks without a stored summary
+            partial_summaries = []
+            calls_made = 0
+            remaining = self.summarizer.MAX_CHUNKS
+            for url in topic["urls"]:
+                source = topic["sources"].get(url)
+                if not source or remaining <= 0:
+                    continue
+
+                for chunk in source["chunks"][:remaining]:
+                    remaining -= 1
+                    stats["chunks_total"] += 1
+
+                    if chunk["summary"] is None:
+                        print(f"[Tracking] Summarizing changed chunk of {url}...")
+                        chunk["summary"] = self.summarizer.summarize_chunk(chunk["text"])
+                        calls_made += 1
+                        stats["chunks_summarized"] += 1
+
+                    if chunk["summary"] is not None:
+                        partial_summaries.append(chunk["summary"])
+                        # Text is only needed until the chunk is summarized
+                        chunk.pop("text", None)
+
+            # Step C: Reduce only if some partial summary changed
+            partials_hash = _hash("\n\n".join(partial_summaries))
+            if partials_hash != topic["partials_hash"] or topic["summary"] is None:
+                summary = self.summarizer.reduce_summaries(partial_summaries)
+                topic["summary"] = summary
+                # Leave the hash unset on failure so the next refresh retries
+                topic["partials_hash"] = None if summary.startswith("Summary unavailable") else partials_hash
+                stats["reduce_ran"] = True
+                calls_made += 1
+
+            stats["llm_calls"] = calls_made
+            topic["updated_at"] = datetime.now().isoformat()
+
+            with self._lock:
+                if topic_id not in self._topics:
+                    # Untracked while refreshing
+                    raise KeyError(topic_id)
+                self._topics[topic_id] = topic
+                self._save()
+                result = self._describe(topic_id, topic)
+
+            result["refresh"] = stats
+            return result
+
+    # --- Helpers ---
+
+    def _topic_lock(self, topic_id: str) -> threading.Lock:
+        with self._lock:
+            return self._topic_locks.setdefault(topic_id, threading.Lock())
+
+    def _diff_chunks(self, cleaned: str, previous_chunks: list) -> list:
+        """
+        Split cleaned text into chunks, reusing stored partial summaries for
+        chunks whose text hash is unchanged. New chunks get summary=None.
+        """
+        known = {c["hash"]: c["summary"] for c in previous_chunks if c.get("summary") is not None}
+        chunks = []
+        for text in self.summarizer.split_chunks(cleaned):
+            chunk_hash = _hash(text)
+            chunks.append({
+                "hash": chunk_hash,
+                "text": text,
+                "summary": known.get(chunk_hash)
+            })
+        return chunks
+
+    @staticmethod
+    def _describe(topic_id: str, topic: dict) -> dict:
+        return {
+            "topic_id": topic_id,
+            "query": topic["query"],
+            "summary": topic["summary"],
+            "sources": topic["urls"],
+            "updated_at": topic["updated_at"]
+        }
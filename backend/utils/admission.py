@@ -0,0 +1,169 @@
+"""
+Admission control for AutoResearcher AI
+Bounds how many research pipelines run at once, globally and per client,
+with a bounded wait queue. Excess load is shed fast with a Retry-After hint
+instead of letting every request slow down together.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted (mapped to HTTP 429)."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded FIFO wait queue.
+
+    Must be used from a single event loop (one per uvicorn worker).
+    Slots are handed directly to the next waiter on release, so queued
+    requests are served in arrival order.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_per_client: int = 2,
+                 max_queue: int = 16, queue_timeout: float = 30.0):
+        self.max_concurrent = max_concurrent
+        self.max_per_client = max_per_client
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._active = 0
+        self._per_client = {}  # client_id -> active + queued
+        self._waiters = deque()
+
+        # Average pipeline duration, used for Retry-After estimates
+        self._avg_service_time = 10.0
+
+        self._counters = {
+            "admitted": 0,
+            "queued": 0,
+            "completed": 0,
+            "rejected_client_limit": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0
+        }
+        self._max_queue_depth = 0
+
+    # --- Public API ---
+
+    @asynccontextmanager
+    async def slot(self, client_id: str):
+        """Hold a pipeline slot for the duration of the block."""
+        await self.acquire(client_id)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_service_time(time.monotonic() - started)
+            self.release(client_id)
+
+    async def acquire(self, client_id: str):
+        if self._per_client.get(client_id, 0) >= self.max_per_client:
+            self._counters["rejected_client_limit"] += 1
+            raise AdmissionRejected("Per-client concurrency limit reached", self._retry_after())
+
+        if self._active < self.max_concurrent and not self._waiters:
+            self._admit(client_id)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._counters["rejected_queue_full"] += 1
+            raise AdmissionRejected("Server busy, wait queue full", self._retry_after())
+
+        # Wait in line; release() hands the slot over by resolving the future
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._per_client[client_id] = self._per_client.get(client_id, 0) + 1
+        self._counters["queued"] += 1
+        self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+
+        try:
+            done, _ = await asyncio.wait({future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued
+            self._abandon(client_id, future)
+            raise
+
+        if not done:
+            self._abandon(client_id, future)
+            self._counters["rejected_queue_timeout"] += 1
+            raise AdmissionRejected("Timed out waiting for capacity", self._retry_after())
+
+        self._counters["admitted"] += 1
+
+    def release(self, client_id: str):
+        self._counters["completed"] += 1
+        self._decrement_client(client_id)
+        self._hand_off()
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "queued": len(self._waiters),
+            "max_queue_depth_seen": self._max_queue_depth,
+            "limits": {
+                "max_concurrent": self.max_concurrent,
+                "max_per_client": self.max_per_client,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout
+            },
+            "avg_service_time": round(self._avg_service_time, 2),
+            "counters": dict(self._counters),
+            "clients": dict(self._per_client)
+        }
+
+    # --- Helpers ---
+
+    def _admit(self, client_id: str):
+        self._active += 1
+        self._per_client[client_id] = self._per_client.get(client_id, 0) + 1
+        self._counters["admitted"] += 1
+
+    def _hand_off(self):
+        """Give a freed slot to the next live waiter, otherwise free it."""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(True)
+                return
+        self._active -= 1
+
+    def _abandon(self, client_id: str, future):
+        if future.done() and not future.cancelled():
+            # Slot was handed over just as we gave up; pass it on
+            self._decrement_client(client_id)
+            self._hand_off()
+            return
+        future.cancel()
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+        self._decrement_client(client_id)
+
+    def _decrement_client(self, client_id: str):
+        remaining = self._per_client.get(client_id, 0) - 1
+        if remaining > 0:
+            self._per_client[client_id] = remaining
+        else:
+            self._per_client.pop(client_id, None)
+
+    def _record_service_time(self, seconds: float):
+        # Exponentially weighted moving average
+        self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * seconds
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until capacity frees up for one more request."""
+        backlog = len(self._waiters) + 1
+        waves = backlog / max(self.max_concurrent, 1)
+        return max(1, math.ceil(self._avg_service_time * waves))
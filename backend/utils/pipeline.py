@@ -0,0 +1,173 @@
+"""
+Streaming research pipeline for AutoResearcher AI
+fetch -> extract -> clean -> chunk -> summarize as generator stages.
+
+Each raw page is released as soon as it has been cleaned, chunks are
+summarized as they fill up, and the merged cleaned text kept for the
+response is capped by a per-request budget. Peak memory per request is
+bounded by the prefetch window of raw pages plus the text budget, not by
+the number of sources.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.cleaner import clean_text
+from utils.profiler import profiled_worker
+
+# Characters of each raw/cleaned page kept for report previews
+EXCERPT_CHARS = 500
+
+
+def _crawl_for(owner_ident, crawler, url):
+    """crawl_url on a prefetch thread, sampled along with owner_ident if profiled."""
+    with profiled_worker(owner_ident):
+        return crawler.crawl_url(url)
+
+
+def fetch_pages(crawler, urls, prefetch: int = 1):
+    """
+    Stage 1+2: fetch each URL and extract its text, in order.
+    With prefetch > 1, up to that many pages are fetched concurrently ahead
+    of the consumer (per-host limits are enforced by the crawler's scheduler).
+    """
+    if prefetch <= 1:
+        for url in urls:
+            text = crawler.crawl_url(url)
+            yield url, text
+            text = None
+        return
+
+    owner = threading.get_ident()
+    with ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="crawl") as executor:
+        window = deque()
+        pending = iter(urls)
+        for url in pending:
+            window.append((url, executor.submit(_crawl_for, owner, crawler, url)))
+            if len(window) >= prefetch:
+                break
+
+        while window:
+            url, future = window.popleft()
+            text = future.result()
+            # Keep the window full while the consumer cleans this page
+            next_url = next(pending, None)
+            if next_url is not None:
+                window.append((next_url, executor.submit(_crawl_for, owner, crawler, next_url)))
+            yield url, text
+            text = None
+
+
+def clean_pages(pages):
+    """Stage 3: clean each page, keeping only a short raw excerpt."""
+    for url, raw in pages:
+        raw_excerpt = raw[:EXCERPT_CHARS]
+        cleaned = clean_text(raw)
+        # Drop the raw page before the next one is fetched
+        raw = None
+        yield url, raw_excerpt, cleaned
+
+
+class ChunkBuffer:
+    """
+    Stage 4: incremental fixed-size chunker.
+    Feeding text pieces yields the same chunks as slicing their
+    concatenation, without ever holding the concatenation.
+    """
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self._pending = []
+        self._pending_len = 0
+
+    def feed(self, text: str):
+        self._pending.append(text)
+        self._pending_len += len(text)
+        while self._pending_len >= self.chunk_size:
+            buffered = "".join(self._pending)
+            yield buffered[:self.chunk_size]
+            rest = buffered[self.chunk_size:]
+            self._pending = [rest] if rest else []
+            self._pending_len = len(rest)
+
+    def flush(self):
+        if self._pending_len:
+            yield "".join(self._pending)
+        self._pending = []
+        self._pending_len = 0
+
+
+def run_pipeline(crawler, summarizer, urls, max_text_chars: int, prefetch: int = 1) -> dict:
+    """
+    Stage 5: drive the stages and summarize (map per chunk, then reduce).
+
+    Returns dict with summary, merged_cleaned, sources, per-source cleaned
+    text (within budget), per-source excerpts and pipeline stats
+    (text_chars, text_budget, truncated_sources).
+    """
+    sections = []
+    source_texts = []
+    excerpts = []
+    text_chars = 0
+    truncated_sources = []
+
+    chunker = ChunkBuffer(summarizer.CHUNK_SIZE)
+    chunk_count = 0
+    partial_summaries = []
+
+    def summarize_chunks(chunks):
+        # Map phase runs as chunks fill up, capped like summarize_multi_source
+        nonlocal chunk_count
+        for chunk in chunks:
+            chunk_count += 1
+            if chunk_count > summarizer.MAX_CHUNKS:
+                continue
+            print(f"[MultiSource] Summarizing chunk {chunk_count}...")
+            summary = summarizer.summarize_chunk(chunk)
+            if summary is not None:
+                partial_summaries.append(summary)
+
+    for url, raw_excerpt, cleaned in clean_pages(fetch_pages(crawler, urls, prefetch)):
+        header = f"\n\n--- SOURCE: {url} ---\n"
+        section = f"{header}{cleaned}\n"
+
+        # Enforce the per-request text budget
+        remaining = max_text_chars - text_chars
+        if len(section) > remaining:
+            print(f"[MultiSource] Text budget reached, truncating {url}")
+            section = section[:max(remaining, 0)]
+            truncated_sources.append(url)
+
+        text_chars += len(section)
+        sections.append(section)
+        source_texts.append({"url": url, "cleaned": section[len(header):].strip()})
+        excerpts.append({
+            "url": url,
+            "raw": raw_excerpt,
+            "cleaned": cleaned[:EXCERPT_CHARS]
+        })
+        summarize_chunks(chunker.feed(section))
+
+    summarize_chunks(chunker.flush())
+
+    if chunk_count > summarizer.MAX_CHUNKS:
+        print(f"[MultiSource] Capped chunks from {chunk_count} to {summarizer.MAX_CHUNKS} for stability.")
+
+    if chunk_count == 0:
+        summary = "No content available"
+    else:
+        summary = summarizer.reduce_summaries(partial_summaries)
+
+    return {
+        "summary": summary,
+        "merged_cleaned": "".join(sections),
+        "sources": [e["url"] for e in excerpts],
+        "source_texts": source_texts,
+        "excerpts": excerpts,
+        "stats": {
+            "text_chars": text_chars,
+            "text_budget": max_text_chars,
+            "truncated_sources": truncated_sources
+        }
+    }
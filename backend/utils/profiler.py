@@ -0,0 +1,177 @@
+"""
+On-demand request profiler for AutoResearcher AI
+A sampling profiler that records the call stack of the thread running one
+pipeline execution, plus any worker threads doing work for it (e.g. the
+crawl prefetch pool, see profiled_worker). Output is a flamegraph-compatible
+folded-stack file (flamegraph.pl, speedscope, inferno) plus a top-N
+hot-function table.
+
+Nothing is installed globally: when a request is not profiled, the only
+cost is one dict lookup per profiled_worker block.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Worker threads of active runs: profiled thread ident -> {worker ident: name}
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+@contextmanager
+def profiled_worker(owner_ident: int):
+    """
+    Mark the current thread as working for owner_ident (a thread ident taken
+    in the caller). If that thread is being profiled, this thread is sampled
+    too for the duration of the block.
+    """
+    ident = threading.get_ident()
+    with _workers_lock:
+        workers = _workers.get(owner_ident)
+        if workers is not None:
+            workers[ident] = threading.current_thread().name
+    try:
+        yield
+    finally:
+        if workers is not None:
+            with _workers_lock:
+                workers.pop(ident, None)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    # Shorten library paths to the package-relative part
+    for marker in ("site-packages" + os.sep, "lib" + os.sep + "python"):
+        if marker in path:
+            path = path.split(marker, 1)[1]
+            break
+    else:
+        path = os.path.relpath(path) if os.path.isabs(path) else path
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ",")
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack (and its registered workers' stacks) every
+    `interval` seconds from a helper thread.
+    """
+
+    def __init__(self, output_dir: str, interval: float = 0.005, top_n: int = 25):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top_n = top_n
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Call fn in the current thread while sampling it.
+        Returns (fn result, profile summary). The profile is stored even if
+        fn raises; the exception is then re-raised.
+        """
+        target_id = threading.get_ident()
+        stacks = Counter()
+        stop = threading.Event()
+        workers = {}
+        seen_workers = set()
+        with _workers_lock:
+            _workers[target_id] = workers
+
+        def sample():
+            while not stop.wait(self.interval):
+                frames = sys._current_frames()
+                with _workers_lock:
+                    # Worker stacks are rooted at a "[thread name]" frame
+                    targets = [(target_id, None)] + [(ident, f"[thread {name}]") for ident, name in workers.items()]
+                for ident, root in targets:
+                    frame = frames.get(ident)
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    if labels:
+                        if root:
+                            labels.append(root)
+                            seen_workers.add(ident)
+                        stacks[";".join(reversed(labels))] += 1
+                frames = None
+
+        sampler = threading.Thread(target=sample, name="request-profiler", daemon=True)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        sampler.start()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            stop.set()
+            sampler.join()
+            with _workers_lock:
+                _workers.pop(target_id, None)
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.thread_time() - cpu_start
+            summary = self._save(stacks, wall_time, cpu_time, 1 + len(seen_workers))
+        return result, summary
+
+    def load(self, profile_id: str, folded: bool = False):
+        """Return a stored profile summary (or its folded stacks), else None."""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(self.output_dir, f"{profile_id}.{'folded' if folded else 'json'}")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read() if folded else json.load(f)
+
+    # --- Helpers ---
+
+    def _save(self, stacks: Counter, wall_time: float, cpu_time: float, threads: int) -> dict:
+        profile_id = uuid.uuid4().hex
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        with open(os.path.join(self.output_dir, f"{profile_id}.folded"), "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        summary = {
+            "profile_id": profile_id,
+            "samples": sum(stacks.values()),
+            "threads": threads,
+            "interval_ms": round(self.interval * 1000, 2),
+            "wall_time_s": round(wall_time, 3),
+            # CPU time of the profiled thread only (not its workers); well
+            # below wall time means blocking waits (network, sleeps, workers)
+            "cpu_time_s": round(cpu_time, 3),
+            "top": self._top_functions(stacks)
+        }
+        with open(os.path.join(self.output_dir, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f)
+        return summary
+
+    def _top_functions(self, stacks: Counter) -> list:
+        total = sum(stacks.values()) or 1
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+
+        return [
+            {
+                "function": label,
+                "self_samples": count,
+                "self_pct": round(100 * count / total, 1),
+                "total_samples": total_counts[label],
+                "total_pct": round(100 * total_counts[label] / total, 1)
+            }
+            for label, count in self_counts.most_common(self.top_n)
+        ]
@@ -0,0 +1,149 @@
+"""
+Query similarity cache for AutoResearcher AI
+Serves a recent research result for paraphrased queries
+("future of AI agents" vs "AI agents future trends") using TF-IDF weighted
+character n-grams and cosine similarity. CPU-only, NumPy.
+"""
+
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "with", "about",
+    "what", "whats", "is", "are", "how", "why", "does", "do", "me", "tell", "explain"
+}
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and stopwords, sort tokens (order-insensitive)."""
+    tokens = re.findall(r"[a-z0-9]+", query.lower())
+    tokens = [t for t in tokens if t not in STOPWORDS] or tokens
+    return " ".join(sorted(tokens))
+
+
+class QuerySimilarityCache:
+    """
+    In-memory nearest-neighbour cache over recent queries.
+
+    Each query is hashed into a fixed-size vector of character 3-gram and
+    word counts (hashing trick, so no vocabulary refits). IDF weights come
+    from document frequencies over the cached queries. The normalized TF-IDF
+    matrix is rebuilt when entries are added or expire, so lookup is a
+    single matrix-vector product.
+    """
+
+    def __init__(self, threshold: float = 0.8, ttl: float = 600, max_entries: int = 512, dims: int = 4096):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.dims = dims
+
+        self._lock = threading.Lock()
+        self._entries = []  # dicts: normalized, query, result, created_at
+        self._counts = np.zeros((0, dims), dtype=np.float32)
+        self._rebuild()
+
+    # --- Public API ---
+
+    def lookup(self, query: str):
+        """
+        Return {"result", "score", "matched_query"} for the most similar
+        fresh entry at or above the threshold, else None.
+        """
+        normalized = normalize_query(query)
+        with self._lock:
+            if self._expire():
+                self._rebuild()
+            if not self._entries:
+                return None
+
+            vector = self._vectorize(normalized) * self._idf
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                return None
+
+            scores = self._weighted @ (vector / norm)
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            if score < self.threshold:
+                return None
+
+            entry = self._entries[best]
+            return {
+                "result": entry["result"],
+                "score": round(score, 4),
+                "matched_query": entry["query"]
+            }
+
+    def add(self, query: str, result: dict):
+        normalized = normalize_query(query)
+        with self._lock:
+            self._expire()
+
+            # Replace an entry for the same normalized query
+            for idx, entry in enumerate(self._entries):
+                if entry["normalized"] == normalized:
+                    self._remove(idx)
+                    break
+
+            if len(self._entries) >= self.max_entries:
+                self._remove(0)  # oldest
+
+            self._entries.append({
+                "normalized": normalized,
+                "query": query,
+                "result": result,
+                "created_at": time.time()
+            })
+            self._counts = np.vstack([self._counts, self._vectorize(normalized)])
+            self._rebuild()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "threshold": self.threshold, "ttl": self.ttl}
+
+    # --- Helpers ---
+
+    def _vectorize(self, normalized: str) -> np.ndarray:
+        """Hashed counts of word tokens and their padded character 3-grams."""
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for token in normalized.split():
+            features = [f"w:{token}"]
+            padded = f" {token} "
+            features.extend(padded[i:i+3] for i in range(len(padded) - 2))
+            for feature in features:
+                vector[zlib.crc32(feature.encode("utf-8")) % self.dims] += 1
+        return vector
+
+    def _rebuild(self):
+        """Recompute IDF weights and the L2-normalized TF-IDF matrix."""
+        n_docs = self._counts.shape[0]
+        df = np.count_nonzero(self._counts, axis=0)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        # Features never seen in the cache stay neutral instead of getting
+        # the highest weight, which would penalize any extra query word
+        idf[df == 0] = 1.0
+        self._idf = idf.astype(np.float32)
+        weighted = self._counts * self._idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        self._weighted = weighted / norms
+
+    def _expire(self) -> int:
+        """Drop expired entries; the caller rebuilds the matrix if any were dropped."""
+        cutoff = time.time() - self.ttl
+        expired = 0
+        while expired < len(self._entries) and self._entries[expired]["created_at"] < cutoff:
+            expired += 1
+        if expired:
+            del self._entries[:expired]
+            self._counts = self._counts[expired:]
+        return expired
+
+    def _remove(self, idx: int):
+        del self._entries[idx]
+        self._counts = np.delete(self._counts, idx, axis=0)
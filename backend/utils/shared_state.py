@@ -0,0 +1,254 @@
+"""
+Shared state for AutoResearcher AI
+Rate limiting, in-flight dedup and result caching that can be shared by
+every uvicorn/gunicorn worker on a host.
+
+Backends (SHARED_STATE_BACKEND):
+- "memory": per-process dicts (single worker, default)
+- "sqlite": a WAL-mode SQLite file shared by all workers on the host
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from config import SHARED_STATE_BACKEND, SHARED_STATE_PATH
+
+
+class SharedState(ABC):
+    """
+    Interface for state shared across workers.
+
+    Values passed to cache_set must be JSON-serializable.
+    """
+
+    @abstractmethod
+    def reserve_rate(self, key: str, rate_per_min: float) -> float:
+        """
+        Reserve the next slot of a rate limit.
+        Returns how many seconds the caller must sleep before using it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def penalize(self, key: str, seconds: float):
+        """Push back every holder of a rate limit (e.g. after a 429)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def cache_get(self, key: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def cache_set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    @abstractmethod
+    def try_lock(self, key: str, ttl: float) -> bool:
+        """Take an expiring lock. Returns False if someone else holds it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def unlock(self, key: str):
+        raise NotImplementedError
+
+    def throttle(self, key: str, rate_per_min: float):
+        """Block until the caller may use one slot of the rate limit."""
+        if rate_per_min <= 0:
+            return
+        delay = self.reserve_rate(key, rate_per_min)
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_or_compute(self, key: str, compute, ttl: float, lock_ttl: float = 300, poll_interval: float = 0.5):
+        """
+        Return the cached value for key, or compute it exactly once across
+        workers. Concurrent callers wait for the in-flight computation
+        instead of repeating it. Exceptions are not cached.
+        """
+        while True:
+            cached = self.cache_get(key)
+            if cached is not None:
+                return cached
+
+            if self.try_lock(f"lock:{key}", lock_ttl):
+                try:
+                    # The previous holder may have stored it since our check
+                    cached = self.cache_get(key)
+                    if cached is not None:
+                        return cached
+                    value = compute()
+                    if ttl > 0:
+                        self.cache_set(key, value, ttl)
+                    return value
+                finally:
+                    self.unlock(f"lock:{key}")
+
+            # Another worker is computing the same key
+            time.sleep(poll_interval)
+
+
+class MemorySharedState(SharedState):
+    """Process-local backend. Correct for a single worker only."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._cache = {}  # key -> (value, expires_at)
+        self._locks = {}  # key -> expires_at
+
+    def reserve_rate(self, key, rate_per_min):
+        interval = 60.0 / rate_per_min
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot.get(key, 0))
+            self._next_slot[key] = slot + interval
+            return slot - now
+
+    def penalize(self, key, seconds):
+        with self._lock:
+            self._next_slot[key] = max(self._next_slot.get(key, 0), time.time() + seconds)
+
+    def cache_get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._cache[key]
+                return None
+            return value
+
+    def cache_set(self, key, value, ttl):
+        with self._lock:
+            now = time.time()
+            # Drop expired entries; most keys (e.g. sources:<id>) are never read again
+            for expired in [k for k, (_, expires_at) in self._cache.items() if expires_at < now]:
+                del self._cache[expired]
+            self._cache[key] = (value, now + ttl)
+
+    def try_lock(self, key, ttl):
+        with self._lock:
+            now = time.time()
+            if self._locks.get(key, 0) > now:
+                return False
+            self._locks[key] = now + ttl
+            return True
+
+    def unlock(self, key):
+        with self._lock:
+            self._locks.pop(key, None)
+
+
+class SQLiteSharedState(SharedState):
+    """
+    Host-wide backend on a SQLite file.
+    Every read-modify-write runs in a BEGIN IMMEDIATE transaction, so the
+    aggregate rate across all worker processes stays within the limit.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS rate (key TEXT PRIMARY KEY, next_slot REAL NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+
+    def _conn(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reserve_rate(self, key, rate_per_min):
+        interval = 60.0 / rate_per_min
+
+        def reserve(conn):
+            now = time.time()
+            row = conn.execute("SELECT next_slot FROM rate WHERE key = ?", (key,)).fetchone()
+            slot = max(now, row[0] if row else 0)
+            conn.execute("INSERT OR REPLACE INTO rate (key, next_slot) VALUES (?, ?)", (key, slot + interval))
+            return slot - now
+
+        return self._transaction(reserve)
+
+    def penalize(self, key, seconds):
+        def push_back(conn):
+            until = time.time() + seconds
+            row = conn.execute("SELECT next_slot FROM rate WHERE key = ?", (key,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO rate (key, next_slot) VALUES (?, ?)", (key, max(until, row[0] if row else 0)))
+
+        self._transaction(push_back)
+
+    def cache_get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cache_set(self, key, value, ttl):
+        def store(conn):
+            now = time.time()
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl)
+            )
+
+        self._transaction(store)
+
+    def try_lock(self, key, ttl):
+        def acquire(conn):
+            now = time.time()
+            row = conn.execute("SELECT expires_at FROM locks WHERE key = ?", (key,)).fetchone()
+            if row and row[0] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO locks (key, expires_at) VALUES (?, ?)", (key, now + ttl))
+            return True
+
+        return self._transaction(acquire)
+
+    def unlock(self, key):
+        self._transaction(lambda conn: conn.execute("DELETE FROM locks WHERE key = ?", (key,)))
+
+
+_shared_state = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> SharedState:
+    """Return the process-wide shared state backend selected by config."""
+    global _shared_state
+    with _shared_state_lock:
+        if _shared_state is None:
+            backend = SHARED_STATE_BACKEND.lower()
+            if backend == "sqlite":
+                _shared_state = SQLiteSharedState(SHARED_STATE_PATH)
+            elif backend == "memory":
+                _shared_state = MemorySharedState()
+            else:
+                raise ValueError(f"Unknown SHARED_STATE_BACKEND '{SHARED_STATE_BACKEND}' (expected memory or sqlite)")
+        return _shared_state
@@ -7,10 +7,12 @@ const API_BASE_URL = process.env.REACT_APP_API_URL || "http://localhost:8000";
 /**
  * Run a research query
  * @param {string} query - URL or topic to research
+ * @param {string[]} [fields] - Only return these response fields (e.g. ["summary", "sources"])
  * @returns {Promise<Object>} Research results
  */
-export async function runResearch(query) {
-    const response = await fetch(`${API_BASE_URL}/research`, {
+export async function runResearch(query, fields) {
+    const params = fields && fields.length ? `?fields=${encodeURIComponent(fields.join(","))}` : "";
+    const response = await fetch(`${API_BASE_URL}/research${params}`, {
         method: "POST",
         headers: {
             "Content-Type": "application/json"
@@ -25,6 +27,22 @@ export async function runResearch(query) {
     return response.json();
 }
 
+/**
+ * Fetch the cleaned text of one source from a research run
+ * @param {string} researchId - research_id from runResearch()
+ * @param {number} index - Position of the source in the sources list
+ * @returns {Promise<Object>} Source URL and cleaned text
+ */
+export async function fetchSourceText(researchId, index) {
+    const response = await fetch(`${API_BASE_URL}/research/${researchId}/sources/${index}`);
+
+    if (!response.ok) {
+        throw new Error(`API request failed: ${response.statusText}`);
+    }
+
+    return response.json();
+}
+
 /**
  * Health check endpoint
  * @returns {Promise<Object>} Health status